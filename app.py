@@ -1,19 +1,156 @@
 import streamlit as st
 import pandas as pd
-from database import DatabaseManager
+from database import DatabaseManager, EXCEL_READ_ENGINE
+from kernels import classify_expiration, UNKNOWN_BUCKET
 from datetime import datetime, timedelta
 import calendar
 import plotly.express as px
 import plotly.graph_objects as go
 import io
-from openpyxl import Workbook
-from openpyxl.styles import PatternFill, Font
 import numpy as np
 import os
+import hashlib
+import json
+import re
+import queue
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import xlsxwriter
+
+# pyarrow's C++ CSV writer is used for exports when it is installed
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:
+    pa = None
+
+CACHE_DIR = os.path.join('data', '.cache')
+# Parsed uploads hold customer data, so only a few recent ones are kept, for a day at most
+CACHE_MAX_FILES = 20
+CACHE_MAX_AGE = 24 * 3600
+EXPIRATION_LABELS = np.array(['Expired', 'Critical', 'Warning', 'OK', 'Unknown'])
+
+def _prune_cache_dir():
+    # Drop cached uploads past CACHE_MAX_AGE, then the least recently used beyond CACHE_MAX_FILES
+    try:
+        entries = [entry for entry in os.scandir(CACHE_DIR) if entry.name.endswith('.parquet')]
+    except FileNotFoundError:
+        return
+    entries.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+    cutoff = time.time() - CACHE_MAX_AGE
+    for position, entry in enumerate(entries):
+        if position >= CACHE_MAX_FILES or entry.stat().st_mtime < cutoff:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _cached_read_excel(raw_bytes):
+    # Parsed uploads are kept on disk as parquet, keyed by the hash of the file contents
+    digest = hashlib.sha256(raw_bytes).hexdigest()
+    cache_path = os.path.join(CACHE_DIR, f"{digest}.parquet")
+    _prune_cache_dir()
+    if os.path.exists(cache_path):
+        # Mark as recently used so pruning keeps it
+        os.utime(cache_path)
+        return pd.read_parquet(cache_path)
+
+    df = pd.read_excel(io.BytesIO(raw_bytes), engine=EXCEL_READ_ENGINE)
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        temp_path = cache_path + '.tmp'
+        df.to_parquet(temp_path, compression="zstd")
+        os.replace(temp_path, cache_path)
+    except Exception:
+        # Parquet support is optional, the parsed frame is still returned
+        pass
+    return df
+
+def _to_csv_bytes(df):
+    if pa is not None:
+        try:
+            buf = io.BytesIO()
+            pacsv.write_csv(pa.Table.from_pandas(df, preserve_index=False), buf)
+            return buf.getvalue()
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+            # Mixed-type columns are left to the pandas writer
+            pass
+    return df.to_csv(index=False).encode('utf-8')
+
+# Figures are cached as plotly JSON, keyed on the primitive arrays they are built from
+@st.cache_data(show_spinner=False)
+def _expiration_timeline_fig(customer_ids, contract_dates, expiration_dates):
+    fig = px.timeline(
+        pd.DataFrame({
+            'customer_id': customer_ids,
+            'contract_date': contract_dates,
+            'expiration_date': expiration_dates
+        }),
+        x_start='contract_date',
+        x_end='expiration_date',
+        y='customer_id',
+        title="Contract Timeline"
+    )
+    return fig.to_json()
+
+@st.cache_data(show_spinner=False)
+def _payment_trend_fig(payment_dates, amounts):
+    fig = px.line(
+        pd.DataFrame({'payment_date': payment_dates, 'amount': amounts})
+            .groupby('payment_date')['amount'].sum().reset_index(),
+        x='payment_date',
+        y='amount',
+        title="Daily Payment Trend"
+    )
+    return fig.to_json()
+
+@st.cache_data(show_spinner=False)
+def _status_pie_fig(names, values):
+    fig = px.pie(
+        values=values,
+        names=names,
+        title="Customer Status Distribution"
+    )
+    return fig.to_json()
+
+def _render_df_head(df, n=1000, **kwargs):
+    # Only the first n rows are sent to the browser
+    st.dataframe(df.head(n), **kwargs)
+    if len(df) > n:
+        st.caption(f"Showing first {n:,} of {len(df):,} rows")
+
+@st.cache_resource
+def _data_version():
+    # Write counter shared by every session in the process, like the cache_data entries it keys
+    return {'epoch': 0, 'lock': threading.Lock()}
+
+@st.cache_resource
+def _get_db():
+    # One DatabaseManager per process, shared by every session, rerun and the import worker
+    return DatabaseManager()
+
+@st.cache_resource
+def _get_import_pool():
+    # One import worker per process; imports from different sessions queue behind each other
+    return ThreadPoolExecutor(max_workers=1)
+
+@st.cache_resource
+def _warm_up_kernels():
+    # Compile the classification kernel once per process so the first import does not pay for it
+    classify_expiration(np.zeros(1, dtype=np.int64), np.empty(1, dtype=np.int8))
+    return True
+
+def _run_import(db, raw_bytes, progress):
+    # Runs on the import worker thread; writes are serialized inside DatabaseManager
+    return db.import_excel_data(io.BytesIO(raw_bytes), progress=progress)
 
 class ISPStreamlitApp:
     def __init__(self):
-        self.db = DatabaseManager()
+        self.db = _get_db()
+        _warm_up_kernels()
+        self._pool = _get_import_pool()
         st.set_page_config(page_title="ISP Management System", layout="wide")
         
     def run(self):
@@ -38,6 +175,32 @@ class ISPStreamlitApp:
 
     # ... [previous methods remain unchanged until show_import_page] ...
 
+    # Cached loaders: the epoch argument is bumped after every write, from any session,
+    # so stale data is dropped everywhere
+    def _data_epoch(self):
+        return _data_version()['epoch']
+
+    def _bump_data_epoch(self):
+        version = _data_version()
+        with version['lock']:
+            version['epoch'] += 1
+
+    @st.cache_data(ttl=30, show_spinner=False)
+    def _load_customers_df(_self, epoch):
+        return _self.db.get_all_customers_columnar()
+
+    @st.cache_data(ttl=30, show_spinner=False)
+    def _load_expirations(_self, start_date, end_date, epoch):
+        return _self.db.get_expirations_columnar(start_date, end_date)
+
+    @st.cache_data(ttl=30, show_spinner=False)
+    def _load_payments(_self, start_date, end_date, epoch):
+        return _self.db.get_payments(start_date, end_date)
+
+    @st.cache_data(ttl=30, show_spinner=False)
+    def _load_customer_status(_self, epoch):
+        return _self.db.get_customer_status()
+
     def show_import_page(self):
         st.header("Import Data")
         
@@ -46,7 +209,7 @@ class ISPStreamlitApp:
         if uploaded_file is not None:
             try:
                 # Preview data
-                df = pd.read_excel(uploaded_file)
+                df = _cached_read_excel(uploaded_file.getvalue())
                 st.subheader("Data Preview")
                 st.dataframe(df.head(10))
                 
@@ -61,22 +224,15 @@ class ISPStreamlitApp:
                     st.metric("Total Value", f"${df['monthly_value'].sum():,.2f}")
                 
                 # Import button
-                if st.button("Import Data"):
-                    # Save uploaded file temporarily
-                    temp_path = os.path.join('data', 'temp_import.xlsx')
-                    with open(temp_path, 'wb') as f:
-                        f.write(uploaded_file.getvalue())
-                    
-                    # Import data
-                    success, message = self.db.import_excel_data(temp_path)
-                    
-                    # Remove temporary file
-                    os.remove(temp_path)
-                    
-                    if success:
-                        st.success(message)
-                    else:
-                        st.error(message)
+                if st.button("Import Data", disabled='import_fut' in st.session_state):
+                    progress = queue.Queue()
+                    st.session_state['import_progress'] = progress
+                    st.session_state['import_total'] = len(df)
+                    st.session_state['import_done'] = 0
+                    st.session_state['import_fut'] = self._pool.submit(
+                        _run_import, self.db, uploaded_file.getvalue(), progress
+                    )
+                    st.rerun()
                 
             except Exception as e:
                 st.error(f"Error reading file: {str(e)}")
@@ -96,9 +252,46 @@ class ISPStreamlitApp:
                 - monthly_value
                 - expiration_date
                 """)
+        
+        self.show_import_progress()
+
+    def show_import_progress(self):
+        future = st.session_state.get('import_fut')
+        if future is None:
+            return
+        
+        if future.done():
+            for key in ('import_fut', 'import_progress', 'import_total', 'import_done'):
+                st.session_state.pop(key, None)
+            try:
+                success, message = future.result()
+            except Exception as e:
+                success, message = False, f"Error importing data: {str(e)}"
+            if success:
+                self._bump_data_epoch()
+                st.success(message)
+            else:
+                st.error(message)
+            return
+        
+        # Drain the row counts reported by the worker and keep polling
+        progress = st.session_state['import_progress']
+        done = st.session_state['import_done']
+        while True:
+            try:
+                done = progress.get_nowait()
+            except queue.Empty:
+                break
+        st.session_state['import_done'] = done
+        
+        total = max(st.session_state['import_total'], 1)
+        placeholder = st.empty()
+        placeholder.progress(min(done / total, 1.0), text=f"Importing... {done:,} of {total:,} rows")
+        time.sleep(0.5)
+        st.rerun()
 
     def process_expiration_data(self, file):
-        df = pd.read_excel(file)
+        df = _cached_read_excel(file.getvalue())
         
         # Validate required columns
         required_columns = ['customer_id', 'expiration_date', 'service_type']
@@ -106,34 +299,42 @@ class ISPStreamlitApp:
             st.error("Excel file must contain: customer_id, expiration_date, service_type")
             return
         
-        # Convert dates to datetime
-        df['expiration_date'] = pd.to_datetime(df['expiration_date'])
-        current_date = datetime.now()
+        # Convert dates to datetime, missing or unparseable dates become NaT
+        df['expiration_date'] = pd.to_datetime(df['expiration_date'], errors='coerce')
+        today = np.datetime64(datetime.now().date(), 'D')
         
-        # Create expiration categories
-        df['days_to_expire'] = (df['expiration_date'] - current_date).dt.days
-        df['status'] = pd.cut(
-            df['days_to_expire'],
-            bins=[-np.inf, 0, 30, 90, np.inf],
-            labels=['Expired', 'Critical', 'Warning', 'OK']
-        )
+        # Create expiration categories, rows without a date get no day count
+        expiration_days = df['expiration_date'].values.astype('datetime64[D]')
+        has_date = ~np.isnat(expiration_days)
+        days_to_expire = (expiration_days - today).astype('int64')
+        df['days_to_expire'] = pd.arrays.IntegerArray(days_to_expire, ~has_date)
+        
+        # Bucket dated rows into (-inf, 0], (0, 30], (30, 90], (90, inf); NaT rows are
+        # masked out before the kernel and labelled Unknown
+        status_idx = np.full(len(days_to_expire), UNKNOWN_BUCKET, dtype=np.int8)
+        dated_idx = np.empty(int(has_date.sum()), dtype=np.int8)
+        classify_expiration(days_to_expire[has_date], dated_idx)
+        status_idx[has_date] = dated_idx
+        df['status'] = EXPIRATION_LABELS[status_idx]
         
         # Display summary
         st.subheader("Expiration Summary")
-        summary = df['status'].value_counts()
+        counts = np.bincount(status_idx, minlength=len(EXPIRATION_LABELS))
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            st.metric("Expired", summary.get('Expired', 0))
+            st.metric("Expired", int(counts[0]))
         with col2:
-            st.metric("Critical (< 30 days)", summary.get('Critical', 0))
+            st.metric("Critical (< 30 days)", int(counts[1]))
         with col3:
-            st.metric("Warning (< 90 days)", summary.get('Warning', 0))
+            st.metric("Warning (< 90 days)", int(counts[2]))
         with col4:
-            st.metric("OK", summary.get('OK', 0))
+            st.metric("OK", int(counts[3]))
+        if counts[UNKNOWN_BUCKET]:
+            st.caption(f"{int(counts[UNKNOWN_BUCKET])} rows have no valid expiration date")
         
         # Display detailed data
-        st.dataframe(df)
+        _render_df_head(df)
         
         # Generate report
         if st.button("Generate Expiration Report"):
@@ -146,7 +347,7 @@ class ISPStreamlitApp:
             )
 
     def process_payment_data(self, file):
-        df = pd.read_excel(file)
+        df = _cached_read_excel(file.getvalue())
         
         # Validate required columns
         required_columns = ['customer_id', 'payment_date', 'amount', 'status']
@@ -156,17 +357,30 @@ class ISPStreamlitApp:
         
         # Process payment data
         df['payment_date'] = pd.to_datetime(df['payment_date'])
-        df['month'] = df['payment_date'].dt.month
-        df['year'] = df['payment_date'].dt.year
+        df['_paid'] = np.equal(df['status'].to_numpy(), 'Paid').astype(np.int8)
+        
+        # Months since 1970-01 as a single nullable int key, year and month derive from it.
+        # Blank dates get NA, which groupby drops like the old year/month keys did
+        payment_months = df['payment_date'].values.astype('datetime64[M]')
+        month_index = pd.arrays.IntegerArray(
+            payment_months.astype('int64'), np.isnat(payment_months)
+        )
+        df['_month'] = month_index
+        df['month'] = 1 + month_index % 12
+        df['year'] = 1970 + month_index // 12
         
         # Display summary by month
         st.subheader("Payment Summary by Month")
-        monthly_summary = df.groupby(['year', 'month']).agg({
+        monthly_summary = df.groupby('_month').agg({
             'amount': 'sum',
             'customer_id': 'count'
-        }).reset_index()
+        })
+        months = monthly_summary.index.to_numpy(dtype='int64')
+        monthly_summary.insert(0, 'year', 1970 + months // 12)
+        monthly_summary.insert(1, 'month', 1 + months % 12)
+        monthly_summary = monthly_summary.reset_index(drop=True)
         
-        st.dataframe(monthly_summary)
+        _render_df_head(monthly_summary)
         
         # Generate payment report
         if st.button("Generate Payment Report"):
@@ -181,47 +395,73 @@ class ISPStreamlitApp:
     def generate_expiration_report(self, df):
         output = io.BytesIO()
         
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            # Write summary sheet
-            summary = df['status'].value_counts().reset_index()
-            summary.columns = ['Status', 'Count']
-            summary.to_excel(writer, sheet_name='Summary', index=False)
-            
-            # Write detailed sheet
-            df_sorted = df.sort_values('days_to_expire')
-            df_sorted.to_excel(writer, sheet_name='Detailed', index=False)
-            
-            # Format workbook
-            workbook = writer.book
-            
-            # Format summary sheet
-            summary_sheet = workbook['Summary']
-            for row in summary_sheet.iter_rows(min_row=2):
-                status = row[0].value
-                if status == 'Expired':
-                    for cell in row:
-                        cell.fill = PatternFill(start_color="FF0000", end_color="FF0000", fill_type="solid")
-                elif status == 'Critical':
-                    for cell in row:
-                        cell.fill = PatternFill(start_color="FFA500", end_color="FFA500", fill_type="solid")
-            
+        # Stream rows straight to the file, each row is flushed once the next one starts
+        workbook = xlsxwriter.Workbook(output, {'constant_memory': True})
+        
+        # Shared formats indexed by row colour code (0 = none, 1 = expired, 2 = critical),
+        # each with a plain and a date variant
+        expired_fill = {'bg_color': '#FF0000'}
+        critical_fill = {'bg_color': '#FFA500'}
+        date_format = {'num_format': 'yyyy-mm-dd'}
+        cell_formats = [
+            (None, workbook.add_format(date_format)),
+            (workbook.add_format(expired_fill), workbook.add_format({**expired_fill, **date_format})),
+            (workbook.add_format(critical_fill), workbook.add_format({**critical_fill, **date_format})),
+        ]
+        status_colors = {'Expired': 1, 'Critical': 2}
+        
+        # Write summary sheet
+        summary = df['status'].value_counts()
+        summary_sheet = workbook.add_worksheet('Summary')
+        summary_sheet.write_row(0, 0, ['Status', 'Count'])
+        for row_num, (status, count) in enumerate(summary.items(), start=1):
+            row_format = cell_formats[status_colors.get(status, 0)][0]
+            summary_sheet.write_row(row_num, 0, [status, int(count)], row_format)
+        
+        # Write detailed sheet
+        df_sorted = df.sort_values('days_to_expire')
+        status = df_sorted['status'].to_numpy()
+        row_colors = np.zeros(len(df_sorted), dtype=np.int8)
+        row_colors[status == 'Expired'] = 1
+        row_colors[status == 'Critical'] = 2
+        is_date = [pd.api.types.is_datetime64_any_dtype(dtype) for dtype in df_sorted.dtypes]
+        
+        detailed_sheet = workbook.add_worksheet('Detailed')
+        detailed_sheet.write_row(0, 0, list(df_sorted.columns))
+        rows = df_sorted.itertuples(index=False, name=None)
+        for row_num, (row, color) in enumerate(zip(rows, row_colors), start=1):
+            formats = cell_formats[color]
+            for col_num, value in enumerate(row):
+                # NaN, NaT and pd.NA are written as blank cells
+                if pd.isna(value):
+                    value = None
+                detailed_sheet.write(row_num, col_num, value, formats[is_date[col_num]])
+        
+        workbook.close()
         output.seek(0)
         return output.getvalue()
 
     def generate_payment_report(self, df):
         output = io.BytesIO()
         
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
+        with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
             # Write monthly summary
-            monthly_summary = df.groupby(['year', 'month']).agg({
+            grouped = df.groupby('_month').agg({
                 'amount': ['sum', 'count'],
-                'status': lambda x: (x == 'Paid').sum()
-            }).reset_index()
-            monthly_summary.columns = ['Year', 'Month', 'Total Amount', 'Total Payments', 'Paid Count']
+                '_paid': 'sum'
+            })
+            months = grouped.index.to_numpy(dtype='int64')
+            monthly_summary = pd.DataFrame({
+                'Year': 1970 + months // 12,
+                'Month': 1 + months % 12,
+                'Total Amount': grouped[('amount', 'sum')].to_numpy(),
+                'Total Payments': grouped[('amount', 'count')].to_numpy(),
+                'Paid Count': grouped[('_paid', 'sum')].to_numpy()
+            })
             monthly_summary.to_excel(writer, sheet_name='Monthly Summary', index=False)
             
             # Write detailed data
-            df.to_excel(writer, sheet_name='Detailed', index=False)
+            df.drop(columns=['_paid', '_month']).to_excel(writer, sheet_name='Detailed', index=False)
         
         output.seek(0)
         return output.getvalue()
@@ -242,54 +482,53 @@ class ISPStreamlitApp:
         
         if st.button("Generate Report"):
             if report_type == "Expiration Report":
-                expirations = self.db.get_expirations(start_date, end_date)
-                if expirations:
-                    df = pd.DataFrame(expirations)
-                    self.show_expiration_analysis(df)
+                expirations = self._load_expirations(start_date, end_date, self._data_epoch())
+                if expirations and len(expirations['customer_id']):
+                    self.show_expiration_analysis(expirations)
             elif report_type == "Payment Report":
-                payments = self.db.get_payments(start_date, end_date)
+                payments = self._load_payments(start_date, end_date, self._data_epoch())
                 if payments:
                     df = pd.DataFrame(payments)
                     self.show_payment_analysis(df)
             else:
-                customers = self.db.get_customer_status()
+                customers = self._load_customer_status(self._data_epoch())
                 if customers:
                     df = pd.DataFrame(customers)
                     self.show_customer_analysis(df)
 
-    def show_expiration_analysis(self, df):
+    def show_expiration_analysis(self, cols):
         st.subheader("Expiration Analysis")
         
-        # Create expiration categories
-        df['days_to_expire'] = (pd.to_datetime(df['expiration_date']) - datetime.now()).dt.days
+        # Days to expiration straight from the columnar arrays
+        days_to_expire = (cols['expiration_date'] - np.datetime64(datetime.now().date(), 'D')).astype('int64')
         
         # Show statistics
         col1, col2, col3 = st.columns(3)
         with col1:
-            st.metric("Total Expirations", len(df))
+            st.metric("Total Expirations", len(days_to_expire))
         with col2:
-            expired = len(df[df['days_to_expire'] < 0])
+            expired = np.count_nonzero(days_to_expire < 0)
             st.metric("Expired", expired)
         with col3:
-            critical = len(df[(df['days_to_expire'] >= 0) & (df['days_to_expire'] <= 30)])
+            critical = np.count_nonzero((days_to_expire >= 0) & (days_to_expire <= 30))
             st.metric("Critical (Next 30 days)", critical)
         
         # Show expiration timeline
-        fig = px.timeline(
-            df,
-            x_start='contract_date',
-            x_end='expiration_date',
-            y='customer_id',
-            title="Contract Timeline"
+        fig_json = _expiration_timeline_fig(
+            cols['customer_id'], cols['contract_date'], cols['expiration_date']
         )
-        st.plotly_chart(fig)
+        st.plotly_chart(go.Figure(json.loads(fig_json)))
 
     def show_payment_analysis(self, df):
         st.subheader("Payment Analysis")
         
         # Show payment statistics
-        total_amount = df['amount'].sum()
-        paid_amount = df[df['status'] == 'Paid']['amount'].sum()
+        amounts = df['amount'].to_numpy(dtype=np.float64, na_value=np.nan)
+        paid = np.equal(df['status'].to_numpy(), 'Paid').astype(np.int8)
+        # Missing amounts count as zero, as Series.sum() skipped them
+        known_amounts = np.nan_to_num(amounts)
+        total_amount = known_amounts.sum()
+        paid_amount = known_amounts @ paid
         payment_rate = (paid_amount / total_amount) * 100 if total_amount > 0 else 0
         
         col1, col2, col3 = st.columns(3)
@@ -301,20 +540,16 @@ class ISPStreamlitApp:
             st.metric("Payment Rate", f"{payment_rate:.1f}%")
         
         # Show payment trend
-        fig = px.line(
-            df.groupby('payment_date')['amount'].sum().reset_index(),
-            x='payment_date',
-            y='amount',
-            title="Daily Payment Trend"
-        )
-        st.plotly_chart(fig)
+        fig_json = _payment_trend_fig(df['payment_date'].to_numpy(), amounts)
+        st.plotly_chart(go.Figure(json.loads(fig_json)))
 
     def show_customer_analysis(self, df):
         st.subheader("Customer Status Analysis")
         
         # Show customer statistics
+        status_counts = df['status'].value_counts()
         total_customers = len(df)
-        active_customers = len(df[df['status'] == 'Active'])
+        active_customers = int(status_counts.get('Active', 0))
         inactive_rate = ((total_customers - active_customers) / total_customers) * 100 if total_customers > 0 else 0
         
         col1, col2, col3 = st.columns(3)
@@ -326,12 +561,8 @@ class ISPStreamlitApp:
             st.metric("Inactive Rate", f"{inactive_rate:.1f}%")
         
         # Show customer distribution
-        fig = px.pie(
-            df,
-            names='status',
-            title="Customer Status Distribution"
-        )
-        st.plotly_chart(fig)
+        fig_json = _status_pie_fig(status_counts.index.to_numpy(), status_counts.to_numpy())
+        st.plotly_chart(go.Figure(json.loads(fig_json)))
 
     def show_customer_management(self):
         st.header("Customer Management")
@@ -392,6 +623,7 @@ class ISPStreamlitApp:
                         
                         success, result = self.db.register_customer(customer_data, payment_data)
                         if success:
+                            self._bump_data_epoch()
                             st.success("Customer added successfully!")
                         else:
                             st.error(f"Failed to add customer: {result}")
@@ -401,66 +633,71 @@ class ISPStreamlitApp:
         # View All Customers Tab
         with tab2:
             try:
-                customers = self.db.get_all_customers()
-                if customers:
-                    df = pd.DataFrame(customers, columns=[
-                        'ID', 'Name', 'Address', 'Phone', 'Mbps', 
-                        'Status', 'Contract Date', 'Payment Day', 'Payment Type', 
-                        'Bank', 'Monthly Value', 'Last Payment Date', 'Payment Status'
-                    ])
+                df = self._load_customers_df(self._data_epoch())
+                if df is not None:
+                    # Factorize once so the filters compare small integer codes
+                    status_codes, status_labels = pd.factorize(df['Status'])
+                    payment_codes, payment_labels = pd.factorize(df['Payment Status'])
                     
                     # Filters
                     col1, col2, col3 = st.columns(3)
                     with col1:
                         status_filter = st.multiselect(
                             "Filter by Status",
-                            options=df['Status'].unique(),
-                            default=df['Status'].unique()
+                            options=status_labels.tolist(),
+                            default=status_labels.tolist()
                         )
                     with col2:
                         payment_status_filter = st.multiselect(
                             "Filter by Payment Status",
-                            options=df['Payment Status'].unique(),
-                            default=df['Payment Status'].unique()
+                            options=payment_labels.tolist(),
+                            default=payment_labels.tolist()
                         )
                     with col3:
                         search_name = st.text_input("Search by Name")
                     
-                    # Apply filters
-                    mask = (
-                        df['Status'].isin(status_filter) &
-                        df['Payment Status'].isin(payment_status_filter)
-                    )
+                    # Apply filters, skipping any multiselect that still has every option selected
+                    mask = np.ones(len(df), dtype=bool)
+                    if len(status_filter) < len(status_labels):
+                        selected = np.flatnonzero(np.isin(status_labels, status_filter))
+                        mask &= np.isin(status_codes, selected)
+                    if len(payment_status_filter) < len(payment_labels):
+                        selected = np.flatnonzero(np.isin(payment_labels, payment_status_filter))
+                        mask &= np.isin(payment_codes, selected)
                     if search_name:
-                        mask = mask & df['Name'].str.contains(search_name, case=False)
+                        pattern = re.compile(search_name, re.IGNORECASE)
+                        mask &= np.fromiter(
+                            (pattern.search(name) is not None for name in df['Name'].to_numpy()),
+                            dtype=bool,
+                            count=len(df)
+                        )
                     
-                    filtered_df = df[mask]
+                    filtered_df = df if mask.all() else df[mask]
                     
                     # Statistics
                     st.subheader("Customer Statistics")
+                    status_counts = filtered_df['Status'].value_counts()
+                    payment_counts = filtered_df['Payment Status'].value_counts()
                     stats_col1, stats_col2, stats_col3, stats_col4 = st.columns(4)
                     with stats_col1:
                         st.metric("Total Customers", len(filtered_df))
                     with stats_col2:
-                        active_count = len(filtered_df[filtered_df['Status'] == 'Active'])
-                        st.metric("Active Customers", active_count)
+                        st.metric("Active Customers", int(status_counts.get('Active', 0)))
                     with stats_col3:
-                        pending_payments = len(filtered_df[filtered_df['Payment Status'] == 'Pending'])
-                        st.metric("Pending Payments", pending_payments)
+                        st.metric("Pending Payments", int(payment_counts.get('Pending', 0)))
                     with stats_col4:
-                        overdue_payments = len(filtered_df[filtered_df['Payment Status'] == 'Overdue'])
-                        st.metric("Overdue Payments", overdue_payments)
+                        st.metric("Overdue Payments", int(payment_counts.get('Overdue', 0)))
                     
                     # Customer Table
                     st.subheader("Customer List")
-                    st.dataframe(
+                    _render_df_head(
                         filtered_df,
                         hide_index=True,
                         use_container_width=True
                     )
                     
                     # Export option
-                    csv = filtered_df.to_csv(index=False).encode('utf-8')
+                    csv = _to_csv_bytes(filtered_df)
                     st.download_button(
                         "Export Customer List",
                         csv,
@@ -476,11 +713,9 @@ class ISPStreamlitApp:
         # Manage Customer Status Tab
         with tab3:
             try:
-                customers = self.db.get_all_customers()
-                if customers:
-                    df = pd.DataFrame(customers, columns=[
-                        'ID', 'Name', 'Status', 'Payment Status', 'Last Payment Date'
-                    ])
+                df = self._load_customers_df(self._data_epoch())
+                if df is not None:
+                    df = df[['ID', 'Name', 'Status', 'Payment Status', 'Last Payment Date']]
                     
                     st.subheader("Manage Customer Status")
                     
@@ -504,6 +739,7 @@ class ISPStreamlitApp:
                                 new_status = 'Active' if customer_data['Status'] == 'Inactive' else 'Inactive'
                                 success = self.db.update_customer_status(customer_id, new_status)
                                 if success:
+                                    self._bump_data_epoch()
                                     st.success(f"Customer status updated to {new_status}")
                                     st.rerun()
                                 else:
@@ -515,6 +751,7 @@ class ISPStreamlitApp:
                                 if st.button("Mark as Paid", key=f"pay_{customer_id}"):
                                     success = self.db.record_payment(customer_id)
                                     if success:
+                                        self._bump_data_epoch()
                                         st.success("Payment recorded successfully")
                                         st.rerun()
                                     else:
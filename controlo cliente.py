@@ -3,9 +3,6 @@ from datetime import datetime, timedelta
 from tkinter import messagebox
 import tkinter as tk
 from tkinter import ttk
-import schedule
-import time
-import threading
 
 class PaymentMonitor:
     def __init__(self, db_connection):
@@ -49,6 +46,27 @@ class PaymentMonitor:
             WHERE NEW.payment_made = 0;
         END;
         ''')
+
+        # Partial index covering only unpaid rows for the overdue check
+        self.cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_payments_due
+        ON payments(payment_made, due_date) WHERE payment_made = 0
+        ''')
+
+        # One-off migration to user_version 1: keep only the latest status row per
+        # customer (older status history is dropped) so the unique index can be built
+        if self.cursor.execute("PRAGMA user_version").fetchone()[0] < 1:
+            self.cursor.execute('''
+            DELETE FROM service_status
+            WHERE status_id NOT IN (
+                SELECT MAX(status_id) FROM service_status GROUP BY customer_id
+            )
+            ''')
+            self.cursor.execute('''
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_service_status_cust
+            ON service_status(customer_id)
+            ''')
+            self.cursor.execute("PRAGMA user_version = 1")
         
         self.conn.commit()
 
@@ -61,14 +79,16 @@ class PaymentMonitor:
             c.name,
             p.due_date,
             p.value,
-            s.is_active
+            1 AS is_active
         FROM customers c
         JOIN payments p ON c.customer_id = p.customer_id
-        LEFT JOIN service_status s ON c.customer_id = s.customer_id
         WHERE p.payment_made = 0 
-        AND date(p.due_date) < date('now')
-        AND (s.is_active = 1 OR s.is_active IS NULL)
-        ''')
+        AND p.due_date < ?
+        AND NOT EXISTS (
+            SELECT 1 FROM service_status s
+            WHERE s.customer_id = c.customer_id AND s.is_active = 0
+        )
+        ''', (current_date.isoformat(),))
         
         expired_payments = self.cursor.fetchall()
         return expired_payments
@@ -106,7 +126,6 @@ class ISPInterface(tk.Tk):
         self.payment_monitor = PaymentMonitor(self.conn)
         
         self.setup_gui()
-        self.start_monitoring()
 
     def setup_gui(self):
         # Expired Payments Frame
@@ -141,22 +160,25 @@ class ISPInterface(tk.Tk):
         self.notif_text.grid(row=0, column=0, padx=5, pady=5)
 
     def refresh_expired_payments(self):
-        # Clear existing items
-        for item in self.expired_tree.get_children():
-            self.expired_tree.delete(item)
-
-        # Get expired payments
+        # Get expired payments and format every row before touching the widget
         expired = self.payment_monitor.check_expired_payments()
-        
-        for payment in expired:
-            status = "Active" if payment[4] else "Inactive"
-            self.expired_tree.insert('', 'end', values=(
+        rows = [
+            (
                 payment[0],  # Customer ID
                 payment[1],  # Name
                 payment[2],  # Due Date
                 f"${payment[3]:.2f}",  # Amount
-                status
-            ))
+                "Active" if payment[4] else "Inactive"
+            )
+            for payment in expired
+        ]
+
+        # Take the tree off screen while rebuilding so it is redrawn once
+        self.expired_tree.grid_forget()
+        self.expired_tree.delete(*self.expired_tree.get_children())
+        for values in rows:
+            self.expired_tree.insert('', 'end', values=values)
+        self.expired_tree.grid(row=0, column=0, padx=5, pady=5)
 
     def toggle_selected_service(self):
         selected = self.expired_tree.selection()
@@ -187,17 +209,13 @@ class ISPInterface(tk.Tk):
                     f"Customer: {payment[1]} - Due Date: {payment[2]} - Amount: ${payment[3]:.2f}\n")
         self.refresh_expired_payments()
 
-    def start_monitoring(self):
-        def run_schedule():
-            while True:
-                schedule.run_pending()
-                time.sleep(1)
-
-        schedule.every(1).minutes.do(self.check_payments)
-        threading.Thread(target=run_schedule, daemon=True).start()
+    def check_payments_tick(self):
+        # Runs on the Tk mainloop, so widgets are only touched from the GUI thread
+        self.check_payments()
+        self.after(60_000, self.check_payments_tick)
 
     def run(self):
-        self.check_payments()  # Initial check
+        self.check_payments_tick()  # Initial check, then once a minute
         self.mainloop()
 
 if __name__ == "__main__":
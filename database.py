@@ -1,7 +1,309 @@
 import sqlite3
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 import pandas as pd
+import numpy as np
 import os
+import re
+import threading
+import atexit
+
+# Bind date objects as ISO strings, the format every date column is stored in
+sqlite3.register_adapter(date, date.isoformat)
+
+# Prefer the Rust-backed calamine reader (xlsx and xls). Without it pandas picks the
+# engine from the file itself, so legacy .xls uploads still go to xlrd
+try:
+    import python_calamine
+    EXCEL_READ_ENGINE = 'calamine'
+except ImportError:
+    EXCEL_READ_ENGINE = None
+
+# Column names for the rows returned by get_all_customers
+CUSTOMER_COLUMNS = [
+    'ID', 'Name', 'Address', 'Phone', 'Mbps', 
+    'Status', 'Contract Date', 'Payment Day', 'Payment Type', 
+    'Bank', 'Monthly Value', 'Last Payment Date', 'Payment Status'
+]
+
+# Typed dtypes for the numeric customer columns, everything else stays object
+CUSTOMER_DTYPES = {
+    'ID': 'int64',
+    'Mbps': 'Int64',
+    'Payment Day': 'Int64',
+    'Monthly Value': 'Float64'
+}
+
+# Rows inserted per executemany call during Excel imports
+IMPORT_BATCH_SIZE = 1000
+
+# Page size for new databases and for the one-time rebuild of older ones, and the
+# size of the memory map used for reads
+PAGE_SIZE = 8192
+MMAP_SIZE = 268435456
+
+# Pages copied per step of the online backup, and the pause between steps in seconds
+BACKUP_PAGES = 256
+BACKUP_SLEEP = 0.010
+
+# Seconds between background WAL checkpoints / PRAGMA optimize runs
+MAINTENANCE_INTERVAL = 900
+
+# Serializes writers across every DatabaseManager and thread in the process
+_write_lock = threading.Lock()
+
+# Database paths that already have a maintenance thread in this process
+_maintenance_paths = set()
+_maintenance_lock = threading.Lock()
+_maintenance_threads = []
+_maintenance_stop = threading.Event()
+
+# Column types applied while the import sheet is parsed. Numeric and date columns are
+# left to the reader and coerced afterwards so bad cells are reported per row.
+IMPORT_COLUMNS = [
+    'name', 'address', 'phone', 'mbps', 'state', 'contract_date', 'payment_day',
+    'payment_type', 'bank', 'iban', 'monthly_value', 'expiration_date'
+]
+IMPORT_DTYPES = {'phone': str, 'iban': str}
+
+# SQL used on the hot paths, kept as constants so every call hits the same cached statement
+_SQL_INSERT_CUSTOMER = '''
+INSERT INTO customers (
+    name, address, phone, mbps, state, 
+    contract_date, payment_day
+)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+'''
+
+# Single-row variant that hands back the new id in the same statement
+_SQL_INSERT_CUSTOMER_RETURNING = _SQL_INSERT_CUSTOMER + "RETURNING customer_id\n"
+
+_SQL_INSERT_PAYMENT_METHOD = '''
+INSERT INTO payment_methods (
+    customer_id, payment_type, bank, 
+    iban, expiration_date
+)
+VALUES (?, ?, ?, ?, ?)
+'''
+
+_SQL_INSERT_PAYMENT = '''
+INSERT INTO payments (
+    customer_id, payment_date, due_date, 
+    value, payment_made
+)
+VALUES (?, NULL, ?, ?, 0)
+'''
+
+_SQL_SELECT_CUSTOMERS = '''
+SELECT 
+    o.customer_id,
+    o.name,
+    o.address,
+    o.phone,
+    o.mbps,
+    o.state,
+    o.contract_date,
+    o.payment_day,
+    o.payment_type,
+    o.bank,
+    o.monthly_value,
+    o.last_payment_date,
+    o.payment_status
+FROM customer_overview o
+'''
+
+# Fills customer_overview from the base tables when the table is first created
+_SQL_BUILD_OVERVIEW = '''
+INSERT OR REPLACE INTO customer_overview (
+    customer_id, name, address, phone, mbps, state, contract_date, payment_day,
+    payment_type, bank, monthly_value, last_payment_date, due_date, payment_made,
+    payment_status
+)
+SELECT 
+    c.customer_id,
+    c.name,
+    c.address,
+    c.phone,
+    c.mbps,
+    c.state,
+    c.contract_date,
+    c.payment_day,
+    pm.payment_type,
+    pm.bank,
+    p.value,
+    p.payment_date,
+    p.due_date,
+    p.payment_made,
+    COALESCE(p.payment_status, 'Pending')
+FROM customers c
+LEFT JOIN payment_methods pm ON pm.payment_method_id = (
+    SELECT MAX(payment_method_id) FROM payment_methods WHERE customer_id = c.customer_id
+)
+LEFT JOIN payments p ON p.payment_id = (
+    SELECT payment_id FROM payments WHERE customer_id = c.customer_id
+    ORDER BY due_date DESC, payment_id DESC LIMIT 1
+)
+'''
+
+# Recomputes payment_status for every payment, used when the column is first added.
+# Today's date is bound from Python so due_date is compared against a constant
+_SQL_SET_PAYMENT_STATUS = '''
+UPDATE payments
+SET payment_status = CASE
+    WHEN payment_made = 1 THEN 'Paid'
+    WHEN due_date < ? THEN 'Overdue'
+    ELSE 'Pending'
+END
+'''
+
+# Flips pending payments whose due date has passed, run on startup
+_SQL_REFRESH_OVERDUE = '''
+UPDATE payments
+SET payment_status = 'Overdue'
+WHERE payment_made = 0
+AND due_date < ?
+AND payment_status != 'Overdue'
+'''
+
+# Customer list filters as (mask bit, filter key, condition); the list and count SQL
+# for every combination is built once here, so a call only picks a string by mask
+_FILTER_CONDITIONS = [
+    (4, 'name', "o.name LIKE ?"),
+    (2, 'state', "o.state = ?"),
+    (1, 'payment_status', "o.payment_status = ?"),
+]
+# Set instead of the name bit when the name filter is looked up in customers_fts
+_NAME_FTS_BIT = 8
+# Extra bit for the list query when a keyset cursor is given
+_CURSOR_BIT = 16
+
+def _where_clause(mask):
+    conditions = [condition for bit, _, condition in _FILTER_CONDITIONS if mask & bit]
+    if mask & _NAME_FTS_BIT:
+        conditions.insert(0, "o.customer_id IN (SELECT rowid FROM customers_fts WHERE customers_fts MATCH ?)")
+    if mask & _CURSOR_BIT:
+        conditions.append("(o.name, o.customer_id) > (?, ?)")
+    return " WHERE " + " AND ".join(conditions) if conditions else ""
+
+_SQL_LIST_CUSTOMERS = {
+    mask: _SQL_SELECT_CUSTOMERS + _where_clause(mask) + " ORDER BY o.name, o.customer_id LIMIT ?"
+    for mask in range(2 * _CURSOR_BIT)
+}
+
+_SQL_COUNT_CUSTOMERS = {
+    mask: "SELECT COUNT(*) FROM customer_overview o" + _where_clause(mask)
+    for mask in range(_CURSOR_BIT)
+}
+
+_SQL_UPDATE_CUSTOMER_STATUS = '''
+UPDATE customers 
+SET state = ? 
+WHERE customer_id = ?
+'''
+
+# Marks only the customer's oldest unpaid payment, found through idx_payments_unpaid
+_SQL_RECORD_PAYMENT = '''
+UPDATE payments 
+SET payment_made = 1,
+    payment_date = ?
+WHERE payment_id = (
+    SELECT payment_id FROM payments
+    WHERE customer_id = ? 
+    AND payment_made = 0
+    ORDER BY due_date LIMIT 1
+)
+'''
+
+_SQL_MONTHLY_PAYMENTS = '''
+SELECT 
+    c.customer_id,
+    c.name,
+    c.phone,
+    p.due_date,
+    p.value,
+    p.payment_made,
+    pm.payment_type,
+    pm.bank,
+    c.payment_day
+FROM customers c
+JOIN payments p ON c.customer_id = p.customer_id
+LEFT JOIN payment_methods pm ON c.customer_id = pm.customer_id
+WHERE p.due_date >= ? 
+AND p.due_date < ?
+ORDER BY p.due_date
+'''
+
+_SQL_EXPIRATIONS = '''
+SELECT 
+    c.customer_id,
+    c.contract_date,
+    pm.expiration_date
+FROM payment_methods pm
+JOIN customers c ON c.customer_id = pm.customer_id
+WHERE pm.expiration_date BETWEEN ? AND ?
+ORDER BY pm.expiration_date
+'''
+
+def _first_due_dates(year, month, payment_day, today):
+    # First due date of each customer, shared by register_customer and the import:
+    # the payment day in the contract month, moved to the next month when that day
+    # has already passed this month, and clamped to the last day of short months.
+    # Payment days outside 1-31 (or missing inputs) come back as NaT.
+    year = np.asarray(year, dtype='float64')
+    month = np.asarray(month, dtype='float64')
+    day = np.asarray(payment_day, dtype='float64')
+    valid = (day >= 1) & (day <= 31) & (day == np.floor(day)) & ~np.isnan(year) & ~np.isnan(month)
+    
+    passed = day < today.day
+    year = np.where(passed & (month == 12), year + 1, year)
+    month = np.where(passed, np.where(month == 12, 1, month + 1), month)
+    
+    months = np.where(valid, (year - 1970) * 12 + month - 1, 0).astype('int64').astype('datetime64[M]')
+    first = months.astype('datetime64[D]')
+    last_day = ((months + 1).astype('datetime64[D]') - first).astype('int64')
+    day = np.minimum(np.where(valid, day, 1).astype('int64'), last_day)
+    return np.where(valid, first + (day - 1), np.datetime64('NaT', 'D'))
+
+def _refresh_payment_status(conn):
+    # Pending payments become overdue once their due date has passed. The table-wide
+    # update only runs the first time this is called on a given day
+    today = date.today().isoformat()
+    row = conn.execute(
+        "SELECT last_run FROM maintenance_log WHERE task = 'refresh_payment_status'"
+    ).fetchone()
+    if row is not None and row[0] == today:
+        return
+    with conn:
+        conn.execute(_SQL_REFRESH_OVERDUE, (today,))
+        conn.execute(
+            "INSERT OR REPLACE INTO maintenance_log (task, last_run) "
+            "VALUES ('refresh_payment_status', ?)", (today,)
+        )
+
+def _run_maintenance(db_path):
+    # Runs at start and then every MAINTENANCE_INTERVAL seconds, on a connection opened
+    # per pass: the daily overdue refresh, WAL truncation and planner statistics
+    while True:
+        conn = sqlite3.connect(db_path)
+        try:
+            # PRAGMA optimize can run ANALYZE, so the whole pass counts as a write
+            with _write_lock:
+                _refresh_payment_status(conn)
+                conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                conn.execute("PRAGMA optimize")
+        except sqlite3.Error as e:
+            print(f"Database error: {e}")
+        finally:
+            conn.close()
+        if _maintenance_stop.wait(MAINTENANCE_INTERVAL):
+            break
+
+def _stop_maintenance():
+    # Wake the maintenance threads at interpreter exit and let a running pass finish
+    _maintenance_stop.set()
+    for thread in _maintenance_threads:
+        thread.join(timeout=5)
+
+atexit.register(_stop_maintenance)
 
 class DatabaseManager:
     def __init__(self, db_name='isp_database.db'):
@@ -12,25 +314,83 @@ class DatabaseManager:
         
         # Full path to database
         self.db_path = os.path.join(self.data_dir, db_name)
-        self.conn = sqlite3.connect(self.db_path)
+        # Keep every parameterized statement we issue compiled on the connection.
+        # All writes go through conn_rw, one thread at a time under the module's _write_lock
+        self.conn_rw = sqlite3.connect(self.db_path, cached_statements=512,
+                                       check_same_thread=False)
+        
+        # Schema setup writes, so it waits for any other manager's writes to finish
+        with _write_lock:
+            self._apply_pragmas(self.conn_rw)
+            self._migrate_page_size()
+            
+            self.cursor = self.conn_rw.cursor()
+            self.create_tables()
+            self.create_indexes()
+            self.setup_triggers()
         
-        # Enable foreign keys and optimize for better performance
-        self.conn.execute("PRAGMA foreign_keys = ON")
-        self.conn.execute("PRAGMA journal_mode = WAL")  # Write-Ahead Logging
-        self.conn.execute("PRAGMA synchronous = NORMAL")
-        self.conn.execute("PRAGMA cache_size = -2000000")  # Use 2GB of cache
-        self.conn.execute("PRAGMA temp_store = MEMORY")
+        # Separate read-only connection for the list and report queries, so under WAL
+        # they never wait behind a write or checkpoint on conn_rw
+        self.conn_ro = sqlite3.connect(self.db_path, cached_statements=512,
+                                       check_same_thread=False)
+        self._apply_pragmas(self.conn_ro)
+        self.conn_ro.execute("PRAGMA query_only = 1")
         
-        self.cursor = self.conn.cursor()
-        self.create_tables()
-        self.create_indexes()
-        self.setup_triggers()
+        # Daily overdue refresh, WAL truncation and planner statistics in the background
+        self._start_maintenance()
+
+    def _apply_pragmas(self, conn):
+        # Enable foreign keys and optimize for better performance.
+        # page_size only applies to a new file, so it must come before WAL is switched on
+        conn.execute(f"PRAGMA page_size = {PAGE_SIZE}")
+        conn.execute("PRAGMA foreign_keys = ON")
+        conn.execute("PRAGMA journal_mode = WAL")  # Write-Ahead Logging
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute("PRAGMA cache_size = -2000000")  # Use 2GB of cache
+        conn.execute("PRAGMA temp_store = MEMORY")
+        conn.execute(f"PRAGMA mmap_size = {MMAP_SIZE}")
+
+    def _migrate_page_size(self):
+        # Databases created with the old 4096-byte pages are rebuilt once. The page
+        # size can't change in WAL mode, so VACUUM runs with a rollback journal.
+        if self.conn_rw.execute("PRAGMA page_size").fetchone()[0] == PAGE_SIZE:
+            return
+        try:
+            self.conn_rw.execute("PRAGMA journal_mode = DELETE")
+            self.conn_rw.execute(f"PRAGMA page_size = {PAGE_SIZE}")
+            self.conn_rw.execute("VACUUM")
+        except sqlite3.Error as e:
+            # Another connection holds the file; try again on the next start
+            print(f"Database error: {e}")
+        finally:
+            self.conn_rw.execute("PRAGMA journal_mode = WAL")
+
+    def _start_maintenance(self):
+        # One maintenance thread per database file, however many managers are opened
+        path = os.path.abspath(self.db_path)
+        with _maintenance_lock:
+            if path in _maintenance_paths:
+                return
+            _maintenance_paths.add(path)
+        
+        thread = threading.Thread(target=_run_maintenance, args=(path,), daemon=True)
+        thread.start()
+        _maintenance_threads.append(thread)
+
+    def _checkpoint(self):
+        # Fold the WAL back into the database file and truncate it; callers hold _write_lock
+        try:
+            self.conn_rw.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        except sqlite3.Error as e:
+            print(f"Database error: {e}")
 
     def create_tables(self):
+        self._drop_autoincrement()
+        
         # Create tables with optimized data types and indexes
         self.cursor.execute('''
         CREATE TABLE IF NOT EXISTS customers (
-            customer_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            customer_id INTEGER PRIMARY KEY,
             name TEXT NOT NULL COLLATE NOCASE,
             address TEXT,
             phone TEXT,
@@ -44,7 +404,7 @@ class DatabaseManager:
 
         self.cursor.execute('''
         CREATE TABLE IF NOT EXISTS payment_methods (
-            payment_method_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            payment_method_id INTEGER PRIMARY KEY,
             customer_id INTEGER,
             payment_type TEXT,
             bank TEXT,
@@ -56,17 +416,124 @@ class DatabaseManager:
 
         self.cursor.execute('''
         CREATE TABLE IF NOT EXISTS payments (
-            payment_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            payment_id INTEGER PRIMARY KEY,
             customer_id INTEGER,
             payment_date DATE,
             due_date DATE,
             value DECIMAL(10,2),
             payment_made BOOLEAN DEFAULT 0,
+            payment_status TEXT DEFAULT 'Pending',
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             FOREIGN KEY (customer_id) REFERENCES customers (customer_id)
         )''')
+        if self._add_column_if_missing('payments', 'payment_status', "TEXT DEFAULT 'Pending'"):
+            self.cursor.execute(_SQL_SET_PAYMENT_STATUS, (date.today().isoformat(),))
 
-        self.conn.commit()
+        # Denormalized customer list, one row per customer with its latest payment method
+        # and payment, kept current by the overview triggers in setup_triggers
+        overview_exists = self.cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'customer_overview'"
+        ).fetchone()
+        self.cursor.execute('''
+        CREATE TABLE IF NOT EXISTS customer_overview (
+            customer_id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL COLLATE NOCASE,
+            address TEXT,
+            phone TEXT,
+            mbps INTEGER,
+            state TEXT,
+            contract_date DATE,
+            payment_day INTEGER,
+            payment_type TEXT,
+            bank TEXT,
+            monthly_value DECIMAL(10,2),
+            last_payment_date DATE,
+            due_date DATE,
+            payment_made BOOLEAN,
+            payment_status TEXT DEFAULT 'Pending'
+        )''')
+        if not overview_exists:
+            self.cursor.execute(_SQL_BUILD_OVERVIEW)
+        elif self._add_column_if_missing('customer_overview', 'payment_status', "TEXT DEFAULT 'Pending'"):
+            self.cursor.execute(_SQL_BUILD_OVERVIEW)
+
+        # Last run date of once-a-day jobs such as the overdue refresh
+        self.cursor.execute('''
+        CREATE TABLE IF NOT EXISTS maintenance_log (
+            task TEXT PRIMARY KEY,
+            last_run DATE
+        )''')
+
+        # Trigram index over customer names so substring searches don't scan the table.
+        # SQLite builds without FTS5 keep using LIKE
+        fts_exists = self.cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'customers_fts'"
+        ).fetchone()
+        try:
+            self.cursor.execute('''
+            CREATE VIRTUAL TABLE IF NOT EXISTS customers_fts USING fts5(
+                name,
+                content='customers',
+                content_rowid='customer_id',
+                tokenize='trigram'
+            )''')
+            self._has_fts = True
+        except sqlite3.OperationalError as e:
+            print(f"Database error: {e}")
+            self._has_fts = False
+        if self._has_fts and not fts_exists:
+            self.cursor.execute("INSERT INTO customers_fts (customers_fts) VALUES ('rebuild')")
+
+        self.conn_rw.commit()
+
+    def _drop_autoincrement(self):
+        # Older databases declared the primary keys AUTOINCREMENT, which costs a
+        # sqlite_sequence write per insert. Rebuild those tables once without it,
+        # keeping the column order and the ids; indexes and triggers come back in
+        # create_indexes / setup_triggers.
+        tables = self.cursor.execute('''
+            SELECT name, sql FROM sqlite_master
+            WHERE type = 'table'
+            AND name IN ('customers', 'payment_methods', 'payments')
+            AND sql LIKE '%AUTOINCREMENT%'
+        ''').fetchall()
+        if not tables:
+            return
+        
+        # Triggers on these tables would otherwise point at a half-swapped schema
+        triggers = self.cursor.execute('''
+            SELECT name FROM sqlite_master
+            WHERE type = 'trigger'
+            AND tbl_name IN ('customers', 'payment_methods', 'payments')
+        ''').fetchall()
+        
+        self.conn_rw.commit()
+        self.conn_rw.execute("PRAGMA foreign_keys = OFF")
+        try:
+            with self.conn_rw:
+                self.conn_rw.execute("BEGIN")
+                for (trigger,) in triggers:
+                    self.conn_rw.execute(f'DROP TRIGGER IF EXISTS "{trigger}"')
+                for table, sql in tables:
+                    sql = re.sub(r'^CREATE TABLE\s+"?\w+"?', f'CREATE TABLE {table}_new', sql)
+                    self.conn_rw.execute(sql.replace(' AUTOINCREMENT', '', 1))
+                    self.conn_rw.execute(f"INSERT INTO {table}_new SELECT * FROM {table}")
+                    self.conn_rw.execute(f"DROP TABLE {table}")
+                    self.conn_rw.execute(f"ALTER TABLE {table}_new RENAME TO {table}")
+                self.conn_rw.execute('''
+                    DELETE FROM sqlite_sequence
+                    WHERE name IN ('customers', 'payment_methods', 'payments')
+                ''')
+        finally:
+            self.conn_rw.execute("PRAGMA foreign_keys = ON")
+
+    def _add_column_if_missing(self, table, column, definition):
+        # Schema migration for databases created before the column existed
+        columns = [row[1] for row in self.cursor.execute(f"PRAGMA table_info({table})")]
+        if column in columns:
+            return False
+        self.cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+        return True
 
     def create_indexes(self):
         # Create indexes for better query performance
@@ -74,14 +541,30 @@ class DatabaseManager:
             "CREATE INDEX IF NOT EXISTS idx_customer_name ON customers(name)",
             "CREATE INDEX IF NOT EXISTS idx_customer_state ON customers(state)",
             "CREATE INDEX IF NOT EXISTS idx_payment_date ON payments(due_date)",
-            "CREATE INDEX IF NOT EXISTS idx_payment_customer ON payments(customer_id)",
             "CREATE INDEX IF NOT EXISTS idx_payment_status ON payments(payment_made)",
+            "CREATE INDEX IF NOT EXISTS idx_overview_name ON customer_overview(name, customer_id)",
+            "CREATE INDEX IF NOT EXISTS idx_overview_status ON customer_overview(payment_status)",
+            "CREATE INDEX IF NOT EXISTS idx_payment_method_customer ON payment_methods(customer_id)",
+            # Latest-payment seek used by the overview: scanned backwards it yields
+            # due_date DESC, payment_id DESC with no sort step
+            "CREATE INDEX IF NOT EXISTS idx_payments_cust_due ON payments(customer_id, due_date)",
+            "CREATE INDEX IF NOT EXISTS idx_payments_unpaid ON payments(customer_id, due_date) WHERE payment_made = 0",
         ]
         
         for index in indexes:
             self.cursor.execute(index)
         
-        self.conn.commit()
+        # Indexes made redundant by the ones above, dropped from older databases
+        obsolete = [
+            'idx_payment_customer',  # left prefix of idx_payments_cust_due
+            'idx_payments_cust_made',  # unpaid lookups use idx_payments_unpaid
+            'idx_customers_list',  # the list reads customer_overview now
+            'idx_payments_status_overdue',  # status filters use idx_overview_status
+        ]
+        for index in obsolete:
+            self.cursor.execute(f"DROP INDEX IF EXISTS {index}")
+        
+        self.conn_rw.commit()
 
     def setup_triggers(self):
         self.cursor.execute('''
@@ -97,279 +580,481 @@ class DatabaseManager:
             WHERE NEW.payment_made = 0;
         END;
         ''')
-        self.conn.commit()
 
-    def register_customer(self, customer_data, payment_data):
-        try:
-            # Insert customer
+        # Stored payment_status, recomputed whenever a payment is added or its state changes.
+        # Compared against the local date, like refresh_payment_status; versions that
+        # used the UTC date('now') are replaced
+        for (trigger,) in self.cursor.execute('''
+            SELECT name FROM sqlite_master
+            WHERE type = 'trigger'
+            AND name IN ('payment_status_ins', 'payment_status_upd')
+            AND sql NOT LIKE '%localtime%'
+        ''').fetchall():
+            self.cursor.execute(f"DROP TRIGGER {trigger}")
+        self.cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS payment_status_ins
+        AFTER INSERT ON payments
+        BEGIN
+            UPDATE payments
+            SET payment_status = CASE
+                WHEN NEW.payment_made = 1 THEN 'Paid'
+                WHEN NEW.due_date < date('now', 'localtime') THEN 'Overdue'
+                ELSE 'Pending'
+            END
+            WHERE payment_id = NEW.payment_id;
+        END;
+        ''')
+        self.cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS payment_status_upd
+        AFTER UPDATE OF payment_made, due_date ON payments
+        BEGIN
+            UPDATE payments
+            SET payment_status = CASE
+                WHEN NEW.payment_made = 1 THEN 'Paid'
+                WHEN NEW.due_date < date('now', 'localtime') THEN 'Overdue'
+                ELSE 'Pending'
+            END
+            WHERE payment_id = NEW.payment_id;
+        END;
+        ''')
+
+        # Keep customer_overview in step with customers, payment_methods and payments
+        overview_triggers = [
+            '''
+            CREATE TRIGGER IF NOT EXISTS overview_cust_ins
+            AFTER INSERT ON customers
+            BEGIN
+                INSERT INTO customer_overview (
+                    customer_id, name, address, phone, mbps, state,
+                    contract_date, payment_day
+                )
+                VALUES (
+                    NEW.customer_id, NEW.name, NEW.address, NEW.phone, NEW.mbps, NEW.state,
+                    NEW.contract_date, NEW.payment_day
+                );
+            END;
+            ''',
+            '''
+            CREATE TRIGGER IF NOT EXISTS overview_cust_upd
+            AFTER UPDATE ON customers
+            BEGIN
+                UPDATE customer_overview
+                SET name = NEW.name,
+                    address = NEW.address,
+                    phone = NEW.phone,
+                    mbps = NEW.mbps,
+                    state = NEW.state,
+                    contract_date = NEW.contract_date,
+                    payment_day = NEW.payment_day
+                WHERE customer_id = NEW.customer_id;
+            END;
+            ''',
+            '''
+            CREATE TRIGGER IF NOT EXISTS overview_cust_del
+            AFTER DELETE ON customers
+            BEGIN
+                DELETE FROM customer_overview WHERE customer_id = OLD.customer_id;
+            END;
+            ''',
+            '''
+            CREATE TRIGGER IF NOT EXISTS overview_method_ins
+            AFTER INSERT ON payment_methods
+            BEGIN
+                UPDATE customer_overview
+                SET payment_type = NEW.payment_type,
+                    bank = NEW.bank
+                WHERE customer_id = NEW.customer_id;
+            END;
+            ''',
+            '''
+            CREATE TRIGGER IF NOT EXISTS overview_method_upd
+            AFTER UPDATE ON payment_methods
+            BEGIN
+                UPDATE customer_overview
+                SET (payment_type, bank) = (
+                    SELECT payment_type, bank FROM payment_methods
+                    WHERE customer_id = NEW.customer_id
+                    ORDER BY payment_method_id DESC LIMIT 1
+                )
+                WHERE customer_id = NEW.customer_id;
+            END;
+            ''',
+            '''
+            CREATE TRIGGER IF NOT EXISTS overview_pay_ins
+            AFTER INSERT ON payments
+            BEGIN
+                UPDATE customer_overview
+                SET (monthly_value, last_payment_date, due_date, payment_made, payment_status) = (
+                    SELECT value, payment_date, due_date, payment_made, payment_status FROM payments
+                    WHERE customer_id = NEW.customer_id
+                    ORDER BY due_date DESC, payment_id DESC LIMIT 1
+                )
+                WHERE customer_id = NEW.customer_id;
+            END;
+            ''',
+            '''
+            CREATE TRIGGER IF NOT EXISTS overview_pay_upd
+            AFTER UPDATE ON payments
+            BEGIN
+                UPDATE customer_overview
+                SET (monthly_value, last_payment_date, due_date, payment_made, payment_status) = (
+                    SELECT value, payment_date, due_date, payment_made, payment_status FROM payments
+                    WHERE customer_id = NEW.customer_id
+                    ORDER BY due_date DESC, payment_id DESC LIMIT 1
+                )
+                WHERE customer_id = NEW.customer_id;
+            END;
+            ''',
+        ]
+        
+        for trigger in overview_triggers:
+            self.cursor.execute(trigger)
+        
+        # Keep customers_fts in step with customer names
+        if self._has_fts:
             self.cursor.execute('''
-            INSERT INTO customers (
-                name, address, phone, mbps, state, 
-                contract_date, payment_day
-            )
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                customer_data['name'],
-                customer_data['address'],
-                customer_data['phone'],
-                customer_data['mbps'],
-                customer_data['state'],
-                customer_data['contract_date'],
-                customer_data['payment_day']
-            ))
-            
-            customer_id = self.cursor.lastrowid
-            
-            # Insert payment method
+            CREATE TRIGGER IF NOT EXISTS customers_fts_ins
+            AFTER INSERT ON customers
+            BEGIN
+                INSERT INTO customers_fts (rowid, name) VALUES (NEW.customer_id, NEW.name);
+            END;
+            ''')
             self.cursor.execute('''
-            INSERT INTO payment_methods (
-                customer_id, payment_type, bank, 
-                iban, expiration_date
-            )
-            VALUES (?, ?, ?, ?, ?)
-            ''', (
-                customer_id,
-                payment_data['payment_type'],
-                payment_data['bank'],
-                payment_data['iban'],
-                payment_data['expiration_date']
-            ))
+            CREATE TRIGGER IF NOT EXISTS customers_fts_del
+            AFTER DELETE ON customers
+            BEGIN
+                INSERT INTO customers_fts (customers_fts, rowid, name)
+                VALUES ('delete', OLD.customer_id, OLD.name);
+            END;
+            ''')
+            self.cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS customers_fts_upd
+            AFTER UPDATE OF name ON customers
+            BEGIN
+                INSERT INTO customers_fts (customers_fts, rowid, name)
+                VALUES ('delete', OLD.customer_id, OLD.name);
+                INSERT INTO customers_fts (rowid, name) VALUES (NEW.customer_id, NEW.name);
+            END;
+            ''')
+        
+        self.conn_rw.commit()
 
-            # Calculate next payment date
-            current_date = datetime.now()
-            due_date = datetime.strptime(customer_data['contract_date'], '%Y-%m-%d')
-            
-            # Set the payment day
-            due_date = due_date.replace(day=int(customer_data['payment_day']))
-            
-            # If the payment day has passed this month, move to next month
-            if due_date.day < current_date.day:
-                # Add one month
-                if due_date.month == 12:
-                    due_date = due_date.replace(year=due_date.year + 1, month=1)
-                else:
-                    due_date = due_date.replace(month=due_date.month + 1)
+    def refresh_payment_status(self):
+        # Normally done by the maintenance thread, at most once a day
+        with _write_lock:
+            _refresh_payment_status(self.conn_rw)
 
-            self.cursor.execute('''
-            INSERT INTO payments (
-                customer_id, payment_date, due_date, 
-                value, payment_made
-            )
-            VALUES (?, NULL, ?, ?, 0)
-            ''', (
-                customer_id,
-                due_date.strftime('%Y-%m-%d'),
-                payment_data['value']
-            ))
-            
-            self.conn.commit()
+    def _exec(self, sql, params=()):
+        # A fresh cursor per call: the connections are shared between threads and
+        # cursors are not, the compiled statement still comes from the connection cache
+        return self.conn_rw.execute(sql, params)
+
+    def _query(self, sql, params=()):
+        # Same as _exec but on the read-only connection
+        return self.conn_ro.execute(sql, params)
+
+    def _do_register(self, customer_data, payment_data):
+        # Inserts the customer, its payment method and first payment without committing
+        
+        # Insert customer, reading its id from the RETURNING row
+        customer_id = self._exec(_SQL_INSERT_CUSTOMER_RETURNING, (
+            customer_data['name'],
+            customer_data['address'],
+            customer_data['phone'],
+            customer_data['mbps'],
+            customer_data['state'],
+            customer_data['contract_date'],
+            customer_data['payment_day']
+        )).fetchall()[0][0]
+        
+        # Insert payment method
+        self._exec(_SQL_INSERT_PAYMENT_METHOD, (
+            customer_id,
+            payment_data['payment_type'],
+            payment_data['bank'],
+            payment_data['iban'],
+            payment_data['expiration_date']
+        ))
+
+        # Calculate next payment date, same rule as the import
+        contract_date = date.fromisoformat(customer_data['contract_date'])
+        due_date = _first_due_dates(
+            [contract_date.year], [contract_date.month],
+            [int(customer_data['payment_day'])], date.today()
+        )[0].item()
+        if due_date is None:
+            raise ValueError(f"Invalid payment day: {customer_data['payment_day']}")
+
+        self._exec(_SQL_INSERT_PAYMENT, (
+            customer_id,
+            due_date,
+            payment_data['value']
+        ))
+        
+        return customer_id
+
+    def register_customer(self, customer_data, payment_data):
+        try:
+            with _write_lock, self.conn_rw:
+                customer_id = self._do_register(customer_data, payment_data)
             return True, customer_id
-        except sqlite3.Error as e:
-            self.conn.rollback()
+        except (sqlite3.Error, ValueError) as e:
             return False, str(e)
 
-    def get_all_customers(self, page=1, per_page=100, filters=None):
+    def _filter_params(self, filters):
+        # Mask of the active filters and their parameters, in _FILTER_CONDITIONS order
+        mask = 0
+        params = []
+        if filters:
+            for bit, key, _ in _FILTER_CONDITIONS:
+                value = filters.get(key)
+                if not value:
+                    continue
+                if key != 'name':
+                    mask |= bit
+                    params.append(value)
+                elif self._has_fts and len(value) >= 3 and ' ' not in value:
+                    # Trigram MATCH on a quoted phrase is a substring search, like LIKE '%..%'
+                    mask |= _NAME_FTS_BIT
+                    params.append('"' + value.replace('"', '""') + '"')
+                else:
+                    # Shorter terms have no trigram to look up
+                    mask |= bit
+                    params.append(f"%{value}%")
+        return mask, params
+
+    def get_all_customers(self, cursor=None, per_page=100, filters=None):
         try:
-            query = '''
-            SELECT 
-                c.customer_id,
-                c.name,
-                c.address,
-                c.phone,
-                c.mbps,
-                c.state,
-                c.contract_date,
-                c.payment_day,
-                pm.payment_type,
-                pm.bank,
-                p.value as monthly_value,
-                p.payment_date as last_payment_date,
-                CASE
-                    WHEN p.payment_made = 1 THEN 'Paid'
-                    WHEN date(p.due_date) < date('now') THEN 'Overdue'
-                    ELSE 'Pending'
-                END as payment_status
-            FROM customers c
-            LEFT JOIN payment_methods pm ON c.customer_id = pm.customer_id
-            LEFT JOIN payments p ON c.customer_id = p.customer_id
-            '''
-            
-            params = []
-            if filters:
-                conditions = []
-                if filters.get('name'):
-                    conditions.append("c.name LIKE ?")
-                    params.append(f"%{filters['name']}%")
-                if filters.get('state'):
-                    conditions.append("c.state = ?")
-                    params.append(filters['state'])
-                if filters.get('payment_status'):
-                    if filters['payment_status'] == 'Paid':
-                        conditions.append("p.payment_made = 1")
-                    elif filters['payment_status'] == 'Overdue':
-                        conditions.append("p.payment_made = 0 AND date(p.due_date) < date('now')")
-                    elif filters['payment_status'] == 'Pending':
-                        conditions.append("p.payment_made = 0 AND date(p.due_date) >= date('now')")
-                
-                if conditions:
-                    query += " WHERE " + " AND ".join(conditions)
+            mask, params = self._filter_params(filters)
             
-            query += " ORDER BY c.name LIMIT ? OFFSET ?"
-            params.extend([per_page, (page - 1) * per_page])
+            # Keyset pagination: cursor is the (name, customer_id) of the previous page's last row
+            if cursor is not None:
+                mask |= _CURSOR_BIT
+                params.extend(cursor)
+            params.append(per_page)
             
-            self.cursor.execute(query, params)
-            return self.cursor.fetchall()
+            # Fetch the whole page here: an open cursor would hold its WAL read snapshot
+            # and keep the checkpoint from truncating the log
+            return self._query(_SQL_LIST_CUSTOMERS[mask], params).fetchall()
         except sqlite3.Error as e:
             print(f"Database error: {e}")
             return None
 
+    def get_all_customers_columnar(self, cursor=None, per_page=100, filters=None):
+        rows = self.get_all_customers(cursor, per_page, filters)
+        if not rows:
+            return None
+        
+        # Transpose once and build each column directly, typed where possible
+        arr = np.asarray(rows, dtype=object)
+        columns = {}
+        for i, name in enumerate(CUSTOMER_COLUMNS):
+            if name in CUSTOMER_DTYPES:
+                columns[name] = pd.array(arr[:, i], dtype=CUSTOMER_DTYPES[name])
+            else:
+                columns[name] = arr[:, i]
+        return pd.DataFrame(columns, copy=False)
+
     def get_total_customers(self, filters=None):
         try:
-            query = "SELECT COUNT(*) FROM customers c"
-            params = []
-            
-            if filters:
-                conditions = []
-                if filters.get('name'):
-                    conditions.append("c.name LIKE ?")
-                    params.append(f"%{filters['name']}%")
-                if filters.get('state'):
-                    conditions.append("c.state = ?")
-                    params.append(filters['state'])
-                
-                if conditions:
-                    query += " WHERE " + " AND ".join(conditions)
-            
-            self.cursor.execute(query, params)
-            return self.cursor.fetchone()[0]
+            mask, params = self._filter_params(filters)
+            return self._query(_SQL_COUNT_CUSTOMERS[mask], params).fetchone()[0]
         except sqlite3.Error as e:
             print(f"Database error: {e}")
             return 0
 
     def update_customer_status(self, customer_id, new_status):
         try:
-            self.cursor.execute('''
-            UPDATE customers 
-            SET state = ? 
-            WHERE customer_id = ?
-            ''', (new_status, customer_id))
-            self.conn.commit()
+            with _write_lock:
+                self._exec(_SQL_UPDATE_CUSTOMER_STATUS, (new_status, customer_id))
+                self.conn_rw.commit()
             return True
         except sqlite3.Error:
             return False
 
     def record_payment(self, customer_id):
         try:
-            current_date = datetime.now().strftime('%Y-%m-%d')
-            self.cursor.execute('''
-            UPDATE payments 
-            SET payment_made = 1,
-                payment_date = ?
-            WHERE customer_id = ? 
-            AND payment_made = 0
-            ''', (current_date, customer_id))
-            self.conn.commit()
+            with _write_lock:
+                self._exec(_SQL_RECORD_PAYMENT, (date.today(), customer_id))
+                self.conn_rw.commit()
             return True
         except sqlite3.Error:
             return False
 
     def close(self):
-        self.conn.close()
+        self.conn_ro.close()
+        with _write_lock:
+            try:
+                self.conn_rw.execute("PRAGMA optimize")
+            except sqlite3.Error as e:
+                print(f"Database error: {e}")
+            self._checkpoint()
+        self.conn_rw.close()
 
     def get_monthly_payments(self, month, year):
         try:
-            self.cursor.execute('''
-            SELECT 
-                c.customer_id,
-                c.name,
-                c.phone,
-                p.due_date,
-                p.value,
-                p.payment_made,
-                pm.payment_type,
-                pm.bank,
-                c.payment_day
-            FROM customers c
-            JOIN payments p ON c.customer_id = p.customer_id
-            LEFT JOIN payment_methods pm ON c.customer_id = pm.customer_id
-            WHERE strftime('%m', p.due_date) = ? 
-            AND strftime('%Y', p.due_date) = ?
-            ORDER BY p.due_date
-            ''', (f"{month:02d}", str(year)))
+            # Half-open range from the first of the month to the first of the next month,
+            # so idx_payment_date is range-scanned; month/year may arrive as strings
+            month, year = int(month), int(year)
+            start = date(year, month, 1)
+            end = date(year + (month == 12), 1 if month == 12 else month + 1, 1)
+            return self._query(
+                _SQL_MONTHLY_PAYMENTS, (start.isoformat(), end.isoformat())
+            ).fetchall()
+        except (ValueError, TypeError):
+            # Not a real month (e.g. 13 or non-numeric): nothing can match, as before
+            return []
+        except sqlite3.Error as e:
+            print(f"Database error: {e}")
+            return None
+
+    def get_expirations_columnar(self, start_date, end_date):
+        try:
+            rows = self._query(
+                _SQL_EXPIRATIONS, (str(start_date), str(end_date))
+            ).fetchall()
             
-            return self.cursor.fetchall()
+            # One typed array per column instead of a list of row tuples
+            return {
+                'customer_id': np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows)),
+                'contract_date': np.array([row[1] for row in rows], dtype='datetime64[D]'),
+                'expiration_date': np.array([row[2] for row in rows], dtype='datetime64[D]')
+            }
         except sqlite3.Error as e:
             print(f"Database error: {e}")
             return None
 
-    def import_excel_data(self, file_path, sheet_name=None):
+    def import_excel_data(self, source, sheet_name=0, progress=None):
         try:
-            # Read Excel file
-            df = pd.read_excel(file_path, sheet_name=sheet_name)
+            # Read Excel file, either from a path or from an in-memory binary buffer
+            if not isinstance(source, (str, os.PathLike)):
+                source.seek(0)
+            df = pd.read_excel(
+                source,
+                sheet_name=sheet_name,
+                engine=EXCEL_READ_ENGINE,
+                dtype=IMPORT_DTYPES
+            )
             
-            # Begin transaction
-            self.conn.execute("BEGIN TRANSACTION")
+            # Canonical column order, anything else in the sheet is ignored
+            missing = [column for column in IMPORT_COLUMNS if column not in df.columns]
+            if missing:
+                return False, f"Error importing data: missing columns {', '.join(missing)}"
+            df = df[IMPORT_COLUMNS].reset_index(drop=True)
             
-            # Process each row
-            success_count = 0
-            error_count = 0
-            errors = []
+            # Coerce whole columns up front, rows that fail coercion are reported as errors
+            current_date = datetime.now()
+            contract_date = pd.to_datetime(df['contract_date'], errors='coerce')
+            expiration_date = pd.to_datetime(df['expiration_date'], errors='coerce')
+            mbps = pd.to_numeric(df['mbps'], errors='coerce')
+            payment_day = pd.to_numeric(df['payment_day'], errors='coerce')
+            monthly_value = pd.to_numeric(df['monthly_value'], errors='coerce')
             
-            for index, row in df.iterrows():
-                try:
-                    customer_data = {
-                        'name': row['name'],
-                        'address': row['address'],
-                        'phone': str(row['phone']),
-                        'mbps': int(row['mbps']),
-                        'state': row['state'],
-                        'contract_date': row['contract_date'].strftime('%Y-%m-%d'),
-                        'payment_day': int(row['payment_day'])
-                    }
-                    
-                    payment_data = {
-                        'payment_type': row['payment_type'],
-                        'bank': row['bank'],
-                        'iban': row['iban'],
-                        'value': float(row['monthly_value']),
-                        'expiration_date': row['expiration_date'].strftime('%Y-%m-%d')
-                    }
-                    
-                    success, result = self.register_customer(customer_data, payment_data)
-                    if success:
-                        success_count += 1
-                    else:
-                        error_count += 1
-                        errors.append(f"Row {index + 2}: {result}")
-                
-                except Exception as e:
-                    error_count += 1
-                    errors.append(f"Row {index + 2}: {str(e)}")
+            # Due dates follow the same rule as register_customer
+            due_date = pd.Series(_first_due_dates(
+                contract_date.dt.year, contract_date.dt.month, payment_day, current_date
+            ), index=df.index)
             
-            # Commit transaction if there were no errors
-            if error_count == 0:
-                self.conn.commit()
-                return True, f"Successfully imported {success_count} customers"
-            else:
-                self.conn.rollback()
-                error_message = f"Imported {success_count} customers with {error_count} errors:\n"
+            checks = {
+                'name': df['name'].isna(),
+                'mbps': mbps.isna(),
+                'contract_date': contract_date.isna(),
+                'payment_day': payment_day.isna() | due_date.isna(),
+                'monthly_value': monthly_value.isna() & df['monthly_value'].notna(),
+                'expiration_date': expiration_date.isna()
+            }
+            check_names = list(checks)
+            check_matrix = np.column_stack([mask.to_numpy() for mask in checks.values()])
+            
+            # Positional access on plain tuples of flags, no per-cell Series lookups
+            errors = []
+            for position in np.flatnonzero(check_matrix.any(axis=1)):
+                flags = check_matrix[position].tolist()
+                fields = [name for name, flag in zip(check_names, flags) if flag]
+                errors.append(f"Row {position + 2}: invalid {', '.join(fields)}")
+            
+            if errors:
+                error_count = len(errors)
+                error_message = f"Imported {len(df) - error_count} customers with {error_count} errors:\n"
                 error_message += "\n".join(errors[:10])
                 if len(errors) > 10:
                     error_message += f"\n... and {len(errors) - 10} more errors"
                 return False, error_message
+            
+            def nullable(column):
+                return df[column].astype(object).where(df[column].notna(), None).tolist()
+            
+            customer_rows = list(zip(
+                df['name'].tolist(),
+                nullable('address'),
+                nullable('phone'),
+                mbps.astype('int64').tolist(),
+                nullable('state'),
+                contract_date.dt.strftime('%Y-%m-%d').tolist(),
+                payment_day.astype('int64').tolist()
+            ))
+            method_rows = list(zip(
+                nullable('payment_type'),
+                nullable('bank'),
+                nullable('iban'),
+                expiration_date.dt.strftime('%Y-%m-%d').tolist()
+            ))
+            payment_rows = list(zip(
+                due_date.dt.strftime('%Y-%m-%d').tolist(),
+                monthly_value.astype(object).where(monthly_value.notna(), None).tolist()
+            ))
+            
+            # Insert in batches inside a single transaction; the connection context
+            # commits at the end or rolls back on error, all under the write lock
+            with _write_lock, self.conn_rw:
+                cur = self.conn_rw.cursor()
+                cur.execute("BEGIN TRANSACTION")
+                for start in range(0, len(df), IMPORT_BATCH_SIZE):
+                    stop = min(start + IMPORT_BATCH_SIZE, len(df))
+                    cur.executemany(_SQL_INSERT_CUSTOMER, customer_rows[start:stop])
+                
+                    # Customer ids of the batch are contiguous and end at the last inserted rowid
+                    last_id = cur.execute("SELECT last_insert_rowid()").fetchone()[0]
+                    customer_ids = range(last_id - (stop - start) + 1, last_id + 1)
+                
+                    cur.executemany(_SQL_INSERT_PAYMENT_METHOD, [
+                        (customer_id, *row)
+                        for customer_id, row in zip(customer_ids, method_rows[start:stop])
+                    ])
+                    cur.executemany(_SQL_INSERT_PAYMENT, [
+                        (customer_id, *row)
+                        for customer_id, row in zip(customer_ids, payment_rows[start:stop])
+                    ])
+                
+                    # Report rows processed so far to the caller
+                    if progress is not None:
+                        progress.put(stop)
+            
+            # A bulk import can grow the WAL well past the auto-checkpoint size
+            with _write_lock:
+                self._checkpoint()
+            
+            return True, f"Successfully imported {len(df)} customers"
                 
         except Exception as e:
-            self.conn.rollback()
             return False, f"Error importing data: {str(e)}"
 
-    def backup_database(self):
+    def backup_database(self, progress=None):
         try:
             backup_path = os.path.join(self.data_dir, 
                 f'backup_{datetime.now().strftime("%Y%m%d_%H%M%S")}.db')
             
+            # Copy BACKUP_PAGES pages at a time from a dedicated source connection,
+            # sleeping between steps so writes on conn_rw can get in.
+            # progress(status, remaining, total) is called after every step.
+            source = sqlite3.connect(self.db_path)
             backup = sqlite3.connect(backup_path)
-            self.conn.backup(backup)
-            backup.close()
+            try:
+                source.backup(backup, pages=BACKUP_PAGES, progress=progress,
+                              sleep=BACKUP_SLEEP)
+            finally:
+                backup.close()
+                source.close()
             return True, backup_path
         except sqlite3.Error as e:
             return False, str(e)
@@ -0,0 +1,31 @@
+import numpy as np
+
+# Upper bounds (inclusive) of the Expired, Critical and Warning buckets
+EXPIRATION_EDGES = np.array([0, 30, 90])
+
+# Day counts computed from NaT come through as the int64 minimum; they get their own
+# bucket instead of falling into Expired
+NAT_DAYS = np.iinfo(np.int64).min
+UNKNOWN_BUCKET = 4
+
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+if HAS_NUMBA:
+    @njit(cache=True, parallel=True, boundscheck=False)
+    def classify_expiration(days, out):
+        # 0 = Expired, 1 = Critical, 2 = Warning, 3 = OK, 4 = Unknown (NaT)
+        for i in prange(days.size):
+            d = days[i]
+            if d == NAT_DAYS:
+                out[i] = UNKNOWN_BUCKET
+            else:
+                out[i] = 0 if d <= 0 else 1 if d <= 30 else 2 if d <= 90 else 3
+else:
+    def classify_expiration(days, out):
+        # Same buckets without numba, one vectorized pass
+        out[:] = np.searchsorted(EXPIRATION_EDGES, days, side='left')
+        out[days == NAT_DAYS] = UNKNOWN_BUCKET